@@ -1,14 +1,18 @@
 import os
 import sys
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import logging
 from typing import List, Dict, Tuple
  
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
- 
+try:
+   from numba import njit
+   _HAS_NUMBA = True
+except ImportError:
+   _HAS_NUMBA = False
 # --------------------
 # Setup logging
 # --------------------
@@ -20,8 +24,9 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(
 ROOT = Path.cwd()
 DATA_DIR = ROOT / "data"
 OUTPUT_DIR = ROOT / "output"
-DATA_DIR.mkdir(exist_ok=True)
-OUTPUT_DIR.mkdir(exist_ok=True)
+for _dir in (DATA_DIR, OUTPUT_DIR):
+   if not _dir.is_dir():  # cheap stat first; skip the mkdir on warm starts
+       _dir.mkdir(parents=True, exist_ok=True)
  
 SAMPLE_CSV = DATA_DIR / "sample_student_scores.csv"
 CLEANED_CSV = OUTPUT_DIR / "cleaned_student_data.csv"
@@ -32,10 +37,40 @@ SUMMARY_TXT = OUTPUT_DIR / "performance_summary.txt"
 # --------------------
 # Utility functions
 # --------------------
-def safe_read_csv(path: Path) -> pd.DataFrame:
-   """Read CSV with basic exception handling and return DataFrame."""
+def safe_read_csv(path: Path, usecols: List[str] = None, use_duckdb: bool = True) -> pd.DataFrame:
+   """Read CSV with basic exception handling and return DataFrame.
+
+   When duckdb is installed, the file is streamed with column pruning and
+   the 0-100 marks filter pushed into the reader itself, so invalid rows
+   never reach pandas. Otherwise pyarrow's multithreaded reader with
+   column projection is tried, and finally the default pandas engine if
+   pyarrow is unavailable or rejects the file (e.g. a missing column).
+   """
    try:
-       df = pd.read_csv(path)
+       if use_duckdb:
+           try:
+               import duckdb
+               df = duckdb.execute(
+                   "SELECT Name, Roll_No, Gender, Subject, "
+                   "TRY_CAST(Marks AS DOUBLE) AS Marks, "
+                   "TRY_CAST(Attendance AS DOUBLE) AS Attendance, Semester "
+                   "FROM read_csv_auto(?) "
+                   "WHERE TRY_CAST(Marks AS DOUBLE) BETWEEN 0 AND 100",
+                   [str(path)]).df()
+               logging.info(f"Loaded data from {path} (duckdb pushdown)")
+               return df
+           except ImportError:
+               pass
+           except Exception as e:
+               # e.g. a column the query names is missing - let pandas
+               # read the file as-is and the caller clean it
+               logging.warning(f"duckdb read failed for {path} ({e}); falling back to pandas")
+       try:
+           df = pd.read_csv(path, engine="pyarrow", usecols=usecols)
+       except (ValueError, KeyError, ImportError):
+           # KeyError covers pyarrow's ArrowKeyError when a requested
+           # column is absent (optional Gender/Attendance/Semester)
+           df = pd.read_csv(path)
        logging.info(f"Loaded data from {path}")
        return df
    except FileNotFoundError:
@@ -48,6 +83,38 @@ def safe_read_csv(path: Path) -> pd.DataFrame:
        logging.error(f"Error reading {path}: {e}")
        raise
  
+def write_csv_fast(df: pd.DataFrame, path: Path):
+   """Write a DataFrame to CSV with pyarrow's multithreaded encoder,
+   falling back to pandas' to_csv if pyarrow is unavailable."""
+   try:
+       import pyarrow as pa
+       import pyarrow.csv as pacsv
+       pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), str(path))
+   except Exception:
+       df.to_csv(path, index=False)
+
+if _HAS_NUMBA:
+   @njit(fastmath=True)
+   def _subject_stats_nb(codes: np.ndarray, marks: np.ndarray, k: int):
+       """Single fused pass accumulating sum/sumsq/count/min/max per
+       subject code, instead of pandas' one pass per aggregate."""
+       sums = np.zeros(k, dtype=np.float64)
+       sumsqs = np.zeros(k, dtype=np.float64)
+       counts = np.zeros(k, dtype=np.int64)
+       mins = np.full(k, np.inf)
+       maxs = np.full(k, -np.inf)
+       for i in range(codes.size):
+           c = codes[i]
+           v = np.float64(marks[i])
+           sums[c] += v
+           sumsqs[c] += v * v
+           counts[c] += 1
+           if v < mins[c]:
+               mins[c] = v
+           if v > maxs[c]:
+               maxs[c] = v
+       return sums, sumsqs, counts, mins, maxs
+
 def ensure_sample_data():
    """Create a small sample CSV if none exists (helps when grading/demo)."""
    if SAMPLE_CSV.exists():
@@ -72,8 +139,15 @@ def ensure_sample_data():
 # --------------------
 # OOP Modeling
 # --------------------
+# Grade boundaries shared by the scalar and vectorized grading paths:
+# avg >= 90 -> A+, >= 80 -> A, >= 70 -> B, >= 60 -> C, >= 50 -> D, else F.
+GRADE_BOUNDS = np.array([50, 60, 70, 80, 90])
+GRADE_LABELS = np.array(["F","D","C","B","A","A+"])
+
 class Student:
    """Student model storing marks per subject and metadata."""
+   __slots__ = ("name", "roll_no", "gender", "marks")
+
    def __init__(self, name: str, roll_no: str, gender: str = None):
        self.name = name
        self.roll_no = roll_no
@@ -90,13 +164,7 @@ class Student:
        return self.total() / len(self.marks) if self.marks else 0.0
  
    def grade(self) -> str:
-       avg = self.average()
-       if avg >= 90: return "A+"
-       if avg >= 80: return "A"
-       if avg >= 70: return "B"
-       if avg >= 60: return "C"
-       if avg >= 50: return "D"
-       return "F"
+       return str(GRADE_LABELS[np.searchsorted(GRADE_BOUNDS, self.average(), side="right")])
  
    def to_dict(self) -> dict:
        d = {
@@ -118,12 +186,42 @@ class Student:
 # --------------------
 class StudentManager:
    def __init__(self):
-       self.students: Dict[str, Student] = {}  # roll_no -> Student
        self.df: pd.DataFrame = pd.DataFrame()
+       # SoA storage: one contiguous (students x subjects) marks matrix plus
+       # parallel identity arrays, filled by build_students. Student objects
+       # are only materialized on demand for CLI display.
+       self._reset_derived()
+
+   def _reset_derived(self):
+       """Clear the SoA arrays and cached views so everything derived is
+       rebuilt from the current self.df on next access."""
+       self._marks: np.ndarray = np.empty((0, 0), dtype=np.float32)
+       self._rolls: np.ndarray = np.empty(0, dtype=object)
+       self._names: np.ndarray = np.empty(0, dtype=object)
+       self._genders: np.ndarray = np.empty(0, dtype=object)
+       self._subjects: List[str] = []
+       self._totals: np.ndarray = np.empty(0, dtype=np.float32)
+       self._avgs: np.ndarray = np.empty(0, dtype=np.float32)
+       self._students_cache: Dict[str, Student] = None
+       self._summary_cache: pd.DataFrame = None
+
+   @property
+   def students(self) -> Dict[str, Student]:
+       """Lazy roll_no -> Student view built from the SoA arrays."""
+       if self._students_cache is None:
+           cache = {}
+           for i, roll in enumerate(self._rolls):
+               student = Student(name=self._names[i], roll_no=roll, gender=self._genders[i])
+               student.marks = {sub: float(v) for sub, v in zip(self._subjects, self._marks[i])
+                                if np.isfinite(v)}
+               cache[roll] = student
+           self._students_cache = cache
+       return self._students_cache
  
    def load_csv(self, path: Path):
        try:
-           df = safe_read_csv(path)
+           df = safe_read_csv(path, usecols=["Name","Roll_No","Gender","Subject",
+                                             "Marks","Attendance","Semester"])
        except Exception:
            raise
        # Basic validations & cleaning
@@ -135,47 +233,120 @@ class StudentManager:
        if "Attendance" not in df.columns:
            df["Attendance"] = np.nan
  
-       # Convert Marks to numeric, coerce errors to NaN then drop rows
-       df["Marks"] = pd.to_numeric(df["Marks"], errors="coerce")
-       df = df.dropna(subset=["Marks","Name","Roll_No","Subject"])
-       # Ensure marks in 0-100
-       df = df[(df["Marks"] >= 0) & (df["Marks"] <= 100)]
-       # store cleaned df
-       self.df = df.copy()
+       # Convert Marks to numeric once, then clean with a single boolean
+       # gather (bad marks, missing ids, out-of-range values) instead of
+       # chained dropna/filter passes that each copy the frame.
+       marks = pd.to_numeric(df["Marks"], errors="coerce").to_numpy(dtype=np.float64)
+       mask = (np.isfinite(marks) & (marks >= 0) & (marks <= 100)
+               & df["Name"].notna().to_numpy()
+               & df["Roll_No"].notna().to_numpy()
+               & df["Subject"].notna().to_numpy())
+       df = df.loc[mask].copy()
+       df["Marks"] = marks[mask]
+       # Low-cardinality string columns become categoricals (int codes under
+       # the hood, so groupby/pivot hash ints instead of Python strings) and
+       # marks fit comfortably in float32. to_csv still writes them out as
+       # plain strings/numbers, so exports are unaffected.
+       for col in ("Subject","Gender","Roll_No"):
+           if col in df.columns:
+               df[col] = df[col].astype("category")
+       df["Marks"] = df["Marks"].astype(np.float32)
+       # store cleaned df (already a fresh copy from the mask gather, so
+       # just renumber the rows rather than copying the blocks again)
+       self.df = df.reset_index(drop=True)
+       self._reset_derived()
        logging.info("CSV cleaned and loaded into manager.")
  
    def build_students(self):
        if self.df.empty:
            logging.error("No loaded DataFrame to build students from.")
            return
-       grouped = self.df.groupby(["Roll_No","Name"])
-       for (roll, name), g in grouped:
-           gender = g.get("Gender", pd.Series([None])).iloc[0] if "Gender" in g else None
-           student = Student(name=name, roll_no=roll, gender=gender)
-           for _, row in g.iterrows():
-               student.add_mark(row["Subject"], row["Marks"])
-           self.students[roll] = student
-       logging.info(f"Built {len(self.students)} Student objects.")
+       # Pivot once to a wide (student x subject) matrix instead of iterating
+       # every row with iterrows() - the reshape happens in pandas' C layer,
+       # and everything downstream works on these contiguous arrays. Gender
+       # stays out of the pivot index (a NaN there would drop the student)
+       # and is attached afterwards with a per-roll lookup.
+       id_cols = ["Roll_No","Name"]
+       wide = self.df.pivot_table(index=id_cols, columns="Subject", values="Marks",
+                                  aggfunc="first").reset_index()
+       self._subjects = [c for c in wide.columns if c not in id_cols]
+       self._marks = wide[self._subjects].to_numpy(dtype=np.float32)
+       self._rolls = wide["Roll_No"].to_numpy()
+       self._names = wide["Name"].to_numpy()
+       if "Gender" in self.df.columns:
+           gender_map = self.df.drop_duplicates("Roll_No").set_index("Roll_No")["Gender"]
+           self._genders = wide["Roll_No"].map(gender_map).to_numpy(dtype=object)
+       else:
+           self._genders = np.full(len(wide), None, dtype=object)
+       self._totals = np.nansum(self._marks, axis=1)
+       counts = np.isfinite(self._marks).sum(axis=1)
+       self._avgs = self._totals / np.maximum(counts, 1)
+       self._students_cache = None
+       self._summary_cache = None
+       logging.info(f"Built marks matrix for {len(self._rolls)} students.")
  
    def student_summary_df(self) -> pd.DataFrame:
-       rows = [s.to_dict() for s in self.students.values()]
-       df_summary = pd.DataFrame(rows)
-       # reorder columns
-       cols = ["Roll_No","Name","Gender"] + [c for c in df_summary.columns if c.startswith("Mark_")] + ["Total","Average","Grade"]
-       cols = [c for c in cols if c in df_summary.columns]
-       return df_summary[cols]
- 
-   def top_bottom_performers(self, top_n=3) -> Tuple[List[Student], List[Student]]:
-       students_sorted = sorted(self.students.values(), key=lambda s: s.average(), reverse=True)
-       top = students_sorted[:top_n]
-       bottom = students_sorted[-top_n:] if len(students_sorted) >= top_n else students_sorted[::-1]
-       return top, bottom
+       # Memoized: load_csv/build_students invalidate the cache, so repeat
+       # callers (export + dashboard in a quick run) reuse the same frame.
+       if self._summary_cache is not None:
+           return self._summary_cache
+       if self._rolls.size == 0:
+           self.build_students()
+       if self._rolls.size == 0:
+           return pd.DataFrame()
+       # Totals/averages were computed once in build_students; grading the
+       # whole cohort is a single branchless searchsorted lookup.
+       grades = GRADE_LABELS[np.searchsorted(GRADE_BOUNDS, self._avgs, side="right")]
+       # hand every column to the DataFrame constructor at once - no dtype
+       # inference over row dicts and no column-by-column insertion
+       data = {"Roll_No": self._rolls, "Name": self._names, "Gender": self._genders}
+       for i, sub in enumerate(self._subjects):
+           data[f"Mark_{sub}"] = self._marks[:, i]
+       data["Total"] = self._totals
+       data["Average"] = np.round(self._avgs, 2)
+       data["Grade"] = grades
+       df_summary = pd.DataFrame(data)
+       self._summary_cache = df_summary
+       return df_summary
+ 
+   def top_bottom_performers(self, top_n=3) -> Tuple[Tuple[np.ndarray, np.ndarray],
+                                                     Tuple[np.ndarray, np.ndarray]]:
+       """Return ((top_idx, top_avgs), (bottom_idx, bottom_avgs)) - indices
+       into the SoA arrays plus the matching precomputed averages, so
+       callers format reports without materializing Student objects."""
+       if self._avgs.size == 0:
+           empty = (np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32))
+           return empty, empty
+       # argpartition selects the k extremes in O(n); only those k entries
+       # are then sorted, instead of sorting the whole cohort.
+       k = min(top_n, self._avgs.size)
+       top_idx = np.argpartition(-self._avgs, k - 1)[:k]
+       top_idx = top_idx[np.argsort(-self._avgs[top_idx])]
+       bot_idx = np.argpartition(self._avgs, k - 1)[:k]
+       bot_idx = bot_idx[np.argsort(-self._avgs[bot_idx])]
+       return (top_idx, self._avgs[top_idx]), (bot_idx, self._avgs[bot_idx])
  
    def subject_wise_stats(self) -> pd.DataFrame:
        # subject level mean, min, max
        if self.df.empty:
            return pd.DataFrame()
-       stats = self.df.groupby("Subject")["Marks"].agg(["mean","min","max","std"]).reset_index()
+       subjects = self.df["Subject"]
+       if _HAS_NUMBA and isinstance(subjects.dtype, pd.CategoricalDtype):
+           # fast path: all four aggregates in one compiled pass over the
+           # category codes and marks arrays
+           codes = subjects.cat.codes.to_numpy(dtype=np.int64)
+           marks = self.df["Marks"].to_numpy(dtype=np.float32)
+           k = len(subjects.cat.categories)
+           sums, sumsqs, counts, mins, maxs = _subject_stats_nb(codes, marks, k)
+           present = counts > 0
+           n = counts[present].astype(np.float64)
+           means = sums[present] / n
+           var = np.maximum(sumsqs[present] - sums[present] ** 2 / n, 0.0) / np.maximum(n - 1, 1)
+           stds = np.where(n > 1, np.sqrt(var), np.nan)
+           return pd.DataFrame({"Subject": subjects.cat.categories[present],
+                                "Mean": means, "Min": mins[present],
+                                "Max": maxs[present], "StdDev": stds})
+       stats = self.df.groupby("Subject", observed=True)["Marks"].agg(["mean","min","max","std"]).reset_index()
        stats = stats.rename(columns={"mean":"Mean","min":"Min","max":"Max","std":"StdDev"})
        return stats
  
@@ -189,6 +360,12 @@ def create_dashboard(manager: StudentManager, out_path: Path = DASHBOARD_PNG):
      3) Line: Subject-wise average (trend across subjects)
      4) Scatter: Attendance vs Average marks (if attendance present)
    """
+   # matplotlib is only needed here, so import it lazily - the other CLI
+   # options shouldn't pay its import cost on startup
+   import matplotlib
+   matplotlib.use("Agg")  # headless CLI: skip GUI backend setup
+   import matplotlib.pyplot as plt
+
    df_summary = manager.student_summary_df()
    if df_summary.empty:
        logging.error("No summary data to plot.")
@@ -207,22 +384,21 @@ def create_dashboard(manager: StudentManager, out_path: Path = DASHBOARD_PNG):
  
    # Attendance vs Average if Attendance exists in original df
    attendance_exists = "Attendance" in manager.df.columns
-   attendance_df = None
    if attendance_exists:
-       # compute attendance by Roll_No (mean)
-       attendance_df = manager.df.groupby("Roll_No")["Attendance"].mean().reset_index()
-       # join to summary
-       att_join = df_summary.merge(attendance_df, on="Roll_No", how="left")
+       # Roll_No is unique per student on both sides, so a Series .map
+       # (direct hash lookup) attaches the column without the full
+       # hash-join and frame rebuild that merge would do
+       att_series = manager.df.groupby("Roll_No", observed=True)["Attendance"].mean()
+       att_join = df_summary.assign(Attendance=df_summary["Roll_No"].map(att_series))
    else:
-       att_join = df_summary.copy()
-       att_join["Attendance"] = np.nan
- 
-   # Create figure
-   fig, axes = plt.subplots(2,2, figsize=(14,10))
-   plt.subplots_adjust(hspace=0.4, wspace=0.3)
+       att_join = df_summary.assign(Attendance=np.nan)
  
+   # Create figure (constrained_layout solves spacing once at draw time,
+   # replacing the subplots_adjust + tight_layout double pass)
+   fig, axes = plt.subplots(2,2, figsize=(14,10), constrained_layout=True)
+
    # 1 Bar chart
-   axes[0,0].bar(x, y)
+   axes[0,0].bar(x, y, rasterized=True)
    axes[0,0].set_title("Average Marks by Student")
    axes[0,0].set_ylabel("Average Marks")
    axes[0,0].tick_params(axis='x', rotation=45)
@@ -241,45 +417,50 @@ def create_dashboard(manager: StudentManager, out_path: Path = DASHBOARD_PNG):
        axes[1,0].text(0.5,0.5,"No subject stats available", ha='center')
  
    # 4 Scatter Attendance vs Average
-   axes[1,1].scatter(att_join["Attendance"], att_join["Average"])
+   axes[1,1].scatter(att_join["Attendance"], att_join["Average"], rasterized=True)
    axes[1,1].set_title("Attendance vs Average Marks")
    axes[1,1].set_xlabel("Attendance (%)")
    axes[1,1].set_ylabel("Average Marks")
  
    fig.suptitle("Student Performance Dashboard", fontsize=16)
-   plt.tight_layout(rect=[0,0,1,0.96])
    fig.savefig(out_path)
+   plt.close(fig)  # release figure memory between runs
    logging.info(f"Dashboard saved to {out_path}")
  
 # --------------------
 # Reporting & Export
 # --------------------
 def export_outputs(manager: StudentManager):
-   # cleaned df
-   manager.df.to_csv(CLEANED_CSV, index=False)
-   logging.info(f"Cleaned data exported to {CLEANED_CSV}")
- 
-   # summary csv
+   # compute shared inputs once, then fan the independent writes out
    summary_df = manager.student_summary_df()
-   summary_df.to_csv(SUMMARY_CSV, index=False)
-   logging.info(f"Student summary exported to {SUMMARY_CSV}")
- 
-   # textual summary
-   top, bottom = manager.top_bottom_performers(top_n=3)
-   total_consumption = summary_df["Total"].sum() if "Total" in summary_df.columns else 0
+   (top_idx, top_avgs), (bot_idx, bot_avgs) = manager.top_bottom_performers(top_n=3)
    class_avg = summary_df["Average"].mean() if "Average" in summary_df.columns else 0
- 
-   with open(SUMMARY_TXT, "w") as f:
-       f.write("Performance Summary Report\n")
-       f.write("=========================\n")
-       f.write(f"Total students: {len(manager.students)}\n")
-       f.write(f"Class Average (Avg of student averages): {class_avg:.2f}\n")
-       f.write("\nTop performers:\n")
-       for s in top:
-           f.write(f"- {s.roll_no} | {s.name} : Avg {s.average():.2f}\n")
-       f.write("\nBottom performers:\n")
-       for s in bottom:
-           f.write(f"- {s.roll_no} | {s.name} : Avg {s.average():.2f}\n")
+
+   def _write_text_summary():
+       # assemble the whole report in memory from the SoA arrays (no
+       # Student objects, no average() recomputation) and write it once
+       rolls, names = manager._rolls, manager._names
+       lines = ["Performance Summary Report",
+                "=" * 25,
+                f"Total students: {rolls.size}",
+                f"Class Average (Avg of student averages): {class_avg:.2f}",
+                "",
+                "Top performers:"]
+       lines += [f"- {rolls[i]} | {names[i]} : Avg {a:.2f}" for i, a in zip(top_idx, top_avgs)]
+       lines += ["", "Bottom performers:"]
+       lines += [f"- {rolls[i]} | {names[i]} : Avg {a:.2f}" for i, a in zip(bot_idx, bot_avgs)]
+       SUMMARY_TXT.write_text("\n".join(lines) + "\n")
+
+   # The three exports don't depend on each other and spend their time in
+   # blocking file I/O, so overlap them on a small thread pool.
+   with ThreadPoolExecutor(max_workers=3) as ex:
+       futures = [ex.submit(write_csv_fast, manager.df, CLEANED_CSV),
+                  ex.submit(write_csv_fast, summary_df, SUMMARY_CSV),
+                  ex.submit(_write_text_summary)]
+       for fut in futures:
+           fut.result()
+   logging.info(f"Cleaned data exported to {CLEANED_CSV}")
+   logging.info(f"Student summary exported to {SUMMARY_CSV}")
    logging.info(f"Text summary exported to {SUMMARY_TXT}")
  
 # --------------------